@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Build research.qmd and the CV PDFs in one process.
+
+publications.bib and other_writing.bib are parsed once and the entries are
+passed to both generate_research() and cv/build.py's build_cv(), instead of
+each script starting its own interpreter and parsing them again.
+
+Run: python3 _scripts/build_all.py
+"""
+
+import shutil
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.resolve().parent
+sys.path.insert(0, str(PROJECT_ROOT / "cv"))
+
+from bibparse import load_bibs  # noqa: E402
+from build import build_cv  # noqa: E402
+from generate_research import PUB_BIB, OTHER_BIB, generate_research  # noqa: E402
+
+
+def main():
+    if not PUB_BIB.exists():
+        print(f"ERROR: {PUB_BIB} not found", file=sys.stderr)
+        sys.exit(1)
+
+    bibs = load_bibs([str(PUB_BIB), str(OTHER_BIB)])
+
+    generate_research(*bibs)
+
+    cv_pdf = build_cv(bibs=bibs)
+    build_cv(years=5, bibs=bibs)
+    shutil.copyfile(cv_pdf, PROJECT_ROOT / "files" / "cv.pdf")
+
+
+if __name__ == "__main__":
+    main()
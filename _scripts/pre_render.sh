@@ -2,8 +2,8 @@
 set -euo pipefail
 
 if [[ "${CI:-}" == "true" ]]; then
-  echo "Skipping research generation on CI"
+  echo "Skipping CV build and research generation on CI"
   exit 0
 fi
 
-python3 _scripts/generate_research.py
+python3 _scripts/build_all.py
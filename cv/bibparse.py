@@ -0,0 +1,380 @@
+"""
+BibTeX parsing shared by the CV build (cv/build.py) and the website's
+research page generator (_scripts/generate_research.py).
+
+Handles the simple .bib format BibDesk produces for cv/data/*.bib.
+
+The module is fully annotated so it can be compiled with mypyc for faster
+parsing. Both scripts import it as plain `bibparse`, so a compiled
+extension sitting next to this file is picked up automatically:
+
+    cd cv && mypyc bibparse.py
+
+Python imports that extension in preference to this file, so after editing
+bibparse.py either re-run mypyc or delete cv/bibparse*.so -- a stale build
+silently shadows the edit. Without a C toolchain this pure-Python version
+is used as-is.
+"""
+
+import hashlib
+import mmap
+import os
+import pickle
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Union, cast
+
+# A parsed entry: lowercase field name -> cleaned value, plus _type and _key
+Entry = dict[str, str]
+
+# Raw .bib contents: bytes for small files, an mmap for large ones
+Buffer = Union[bytes, mmap.mmap]
+
+# Files at least this big are memory-mapped instead of read into memory
+MMAP_THRESHOLD = 1 << 20
+
+CACHE_DIR = Path(__file__).parent.resolve() / "_generated" / ".bibcache"
+
+# ---------------------------------------------------------------------------
+# Patterns (compiled once at import)
+# ---------------------------------------------------------------------------
+
+# The scanner works on raw bytes (so it can run over an mmap); only keys
+# and values are decoded. Every delimiter is ASCII, which is safe in UTF-8.
+_RE_ENTRY = re.compile(rb"@(\w+)\s*\{")               # @type{
+_RE_FIELD = re.compile(rb"([^\s=,{}\"]+)\s*=\s*")     # name =
+_RE_SEP = re.compile(rb"[\s,]*")                      # between fields
+_RE_BARE_END = re.compile(rb"[,}]")                   # end of a bare value
+_RE_NON_FIELD = re.compile(rb"[^\s,{}\"]+")           # stray text in a body
+
+# @-blocks that aren't bibliography entries
+_SKIPPED_TYPES = {"comment", "preamble", "string"}
+
+# All LaTeX markup clean_latex() rewrites, as one alternation so each value
+# is scanned once. Exactly one group pair matches:
+#   \textit{x} / \textbf{x} / \emph{x}  -> group 1
+#   \href{url}{x}                        -> group 2
+#   \~{n} / \'{e} / \"{u}                -> groups 3 (accent), 4 (letter)
+_RE_MARKUP = re.compile(
+    r"\\(?:"
+    r"(?:textit|textbf|emph)\{([^}]*)\}"
+    r"|href\{[^}]*\}\{([^}]*)\}"
+    r"|([~'\"])\{([^}])\}"
+    r")"
+)
+_RE_AND = re.compile(r"\s+and\s+")
+
+# Combining character for each accent command: \~{n}, \'{e}, \"{u}
+_ACCENTS = {"~": "\u0303", "'": "\u0301", '"': "\u0308"}
+
+# Braces left over after markup removal (capitalization protection)
+_STRIP_BRACES = str.maketrans("", "", "{}")
+
+
+# ---------------------------------------------------------------------------
+# BibTeX parser (simple, handles the .bib format we produce)
+# ---------------------------------------------------------------------------
+
+def _decode(raw: bytes) -> str:
+    """Decode a slice of a .bib file, normalizing newlines like read_text()."""
+    text = raw.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def parse_bib(path: str) -> list[Entry]:
+    """Parse a .bib file into a list of dicts.
+
+    Large files are memory-mapped and scanned in place rather than read
+    and decoded whole; small ones are read in a single call.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            return _parse_bib_buffer(f.read(), path)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _parse_bib_buffer(mm, path)
+
+
+def _parse_bib_buffer(text: Buffer, path: str) -> list[Entry]:
+    """Parse the raw contents of a .bib file (see parse_bib)."""
+    entries: list[Entry] = []
+
+    # Each @type{key, field = value, ... } block is scanned in one forward
+    # pass: the fields are read straight out of `text` up to the entry's
+    # closing brace, so the body is never sliced out and scanned again.
+    i = 0
+    while i < len(text):
+        m = _RE_ENTRY.search(text, i)
+        if not m:
+            break
+        entry_type = _decode(m.group(1)).lower()
+        start = m.end()  # position right after the opening {
+
+        # Not entries (BibDesk writes its static groups as an @comment);
+        # jump past their balanced braces
+        if entry_type in _SKIPPED_TYPES:
+            i = _scan_braces(text, start)
+            continue
+
+        # Find key (everything up to first comma)
+        key_end = text.find(b",", start)
+        if key_end == -1:
+            line_num = text[:start].count(b"\n") + 1
+            raise ValueError(
+                f"{path}: malformed entry near line {line_num} — "
+                f"expected a comma after @{entry_type}{{key"
+            )
+        key = _decode(text[start:key_end]).strip()
+
+        try:
+            entry, close = _scan_fields(text, key_end + 1)
+        except Exception as exc:
+            raise ValueError(
+                f"{path}: error parsing fields of @{entry_type}{{{key}}}: {exc}"
+            ) from exc
+
+        if close >= len(text):
+            raise ValueError(
+                f"{path}: unmatched braces in entry @{entry_type}{{{key}}}"
+            )
+
+        entry["_type"] = entry_type
+        entry["_key"] = key
+        entries.append(entry)
+        i = close + 1
+
+    return entries
+
+
+def parse_bib_fields(body: str) -> Entry:
+    """Extract field = {value} pairs from bib entry body."""
+    fields, _ = _scan_fields(body.encode("utf-8"), 0)
+    return fields
+
+
+def _scan_braces(s: Buffer, k: int) -> int:
+    """Return the index just past the } matching an { that opened before k.
+
+    Jumps between braces with find rather than stepping through every
+    byte. Returns len(s) if the braces never balance.
+    """
+    depth = 1
+    close = s.find(b"}", k)
+    while close != -1:
+        # Each { before the next } nests one level deeper; the } found
+        # stays valid until it is consumed, so it isn't searched for again.
+        open_ = s.find(b"{", k, close)
+        if open_ != -1:
+            depth += 1
+            k = open_ + 1
+            continue
+        depth -= 1
+        k = close + 1
+        if depth == 0:
+            return k
+        close = s.find(b"}", k)
+    return len(s)
+
+
+def _skip_non_field(text: Buffer, pos: int) -> int:
+    """Step over one run of non-field text in an entry body, jumping whole
+    braced or quoted groups so their contents can't end the entry early."""
+    c = text[pos:pos + 1]
+    if c == b"{":
+        return _scan_braces(text, pos + 1)
+    if c == b'"':
+        k = text.find(b'"', pos + 1)
+        return len(text) if k == -1 else k + 1
+    m = _RE_NON_FIELD.match(text, pos)
+    assert m is not None  # pos is not at a separator, brace or quote
+    return m.end()
+
+
+def _scan_fields(text: Buffer, pos: int) -> tuple[Entry, int]:
+    """Scan `name = value` pairs from pos up to the closing } of the entry.
+
+    Returns (fields, end): end is the index of that }, or len(text) if the
+    text ran out first.
+    """
+    fields: Entry = {}
+    n = len(text)
+    while True:
+        # Between fields: skip separators, stop at the closing brace
+        sep = _RE_SEP.match(text, pos)
+        assert sep is not None  # [\s,]* always matches
+        pos = sep.end()
+        if pos >= n or text[pos:pos + 1] == b"}":
+            break
+
+        m = _RE_FIELD.match(text, pos)
+        if not m:
+            # Not a field (e.g. the `# {B}` of a concatenation, or stray
+            # text): skip it, as the old search-based parser did
+            pos = _skip_non_field(text, pos)
+            continue
+        field_name = _decode(m.group(1)).lower()
+        val_start = m.end()  # the pattern already skips whitespace after =
+
+        if val_start >= n:
+            pos = n
+            break
+
+        opener = text[val_start:val_start + 1]
+        if opener == b"{":
+            # Find matching }
+            k = _scan_braces(text, val_start + 1)
+            raw = text[val_start + 1 : k - 1]
+            pos = k
+        elif opener == b'"':
+            # Find matching "
+            k = text.find(b'"', val_start + 1)
+            if k == -1:
+                raise ValueError(f"unterminated quoted value for '{field_name}'")
+            raw = text[val_start + 1 : k]
+            pos = k + 1
+        else:
+            # Bare value (number or macro), up to the next , or }
+            end = _RE_BARE_END.search(text, val_start)
+            k = end.start() if end else n
+            raw = text[val_start:k]
+            pos = k
+
+        # Decode, then clean up LaTeX commands in value
+        fields[field_name] = clean_latex(_decode(raw))
+
+    # Convert BibTeX page ranges -- to en-dash –
+    if "pages" in fields:
+        fields["pages"] = fields["pages"].replace("--", "–")
+
+    return fields, pos
+
+
+def _replace_markup(m: re.Match[str]) -> str:
+    """Replacement text for one _RE_MARKUP match."""
+    style, href, accent, letter = m.groups()
+    if accent is not None:
+        return letter + _ACCENTS[accent]
+    return style if style is not None else href
+
+
+def clean_latex(s: str) -> str:
+    """Remove common LaTeX markup from a string."""
+    # Most values (years, DOIs, pages) have no markup at all
+    if "\\" not in s and "{" not in s and "}" not in s:
+        return s.strip()
+    # Unwrap markup; repeat so nested commands come out too
+    n = 1
+    while n:
+        s, n = _RE_MARKUP.subn(_replace_markup, s)
+    s = s.replace("\\~n", "ñ")
+    # \& -> &
+    s = s.replace("\\&", "&")
+    s = s.translate(_STRIP_BRACES)
+    return s.strip()
+
+
+# ---------------------------------------------------------------------------
+# Parse cache (skips re-parsing a .bib that hasn't changed since last build)
+# ---------------------------------------------------------------------------
+
+def _cache_path(path: str) -> Path:
+    """Cache file for a .bib: one per source path, overwritten on each miss
+    so stale results never pile up."""
+    digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+    return CACHE_DIR / f"{digest}.pkl"
+
+
+def _cache_stamp(path: str) -> tuple[int, int, int]:
+    """What a cached parse is valid for: the .bib's mtime and size, plus the
+    parser's own mtime so edits here invalidate old results."""
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size, os.stat(__file__).st_mtime_ns)
+
+
+def load_bib_cached(path: str) -> list[Entry]:
+    """Like parse_bib, but reuse the parsed entries from the last run if the
+    file is unchanged."""
+    cache_path = _cache_path(path)
+    stamp = _cache_stamp(path)
+    try:
+        with open(cache_path, "rb") as f:
+            cached_stamp, entries = cast(
+                tuple[tuple[int, int, int], list[Entry]], pickle.load(f)
+            )
+        if cached_stamp == stamp:
+            return entries
+    except Exception:
+        pass  # missing, unreadable or corrupt cache: parse afresh
+
+    entries = parse_bib(path)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump((stamp, entries), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # caching is best-effort
+    return entries
+
+
+def load_bibs(paths: list[str]) -> list[Optional[list[Entry]]]:
+    """Load several .bib files with load_bib_cached.
+
+    Returns one entry list per path, in order; missing files give None.
+    """
+    return [load_bib_cached(path) if os.path.exists(path) else None
+            for path in paths]
+
+
+def format_authors(entry: Entry) -> str:
+    """Format author string for display."""
+    # If there's a custom display string, use it
+    if "authordisplay" in entry:
+        return entry["authordisplay"]
+
+    return _format_author_field(entry.get("author", ""))
+
+
+@lru_cache(maxsize=None)
+def _format_author_field(raw: str) -> str:
+    """Format a raw BibTeX author field. Cached on the string itself, since
+    the same author lists recur across a CV and are rendered more than once.
+    """
+    # Single author: no " and " to split on
+    if "and" not in raw:
+        return "others" if raw.lower() == "others" else raw.strip()
+
+    # Split on " and "
+    authors = [a.strip() for a in _RE_AND.split(raw)]
+
+    formatted: list[str] = []
+    for a in authors:
+        if a.lower() == "others":
+            # This shouldn't happen if authordisplay is set, but just in case
+            formatted.append("others")
+            continue
+        # "Last, First" format — keep as-is for CV style
+        formatted.append(a)
+
+    if len(formatted) == 1:
+        return formatted[0]
+    elif len(formatted) == 2:
+        return f"{formatted[0]} and {formatted[1]}"
+    else:
+        return ", ".join(formatted[:-1]) + ", and " + formatted[-1]
+
+
+def get_url(entry: Entry) -> str:
+    """Get the best URL for a publication.
+
+    Prefers a local file (for the website) over DOI/URL links.
+    """
+    if "file" in entry and entry["file"]:
+        return entry["file"]
+    if "doi" in entry and entry["doi"]:
+        return f"https://doi.org/{entry['doi']}"
+    return entry.get("url", "")
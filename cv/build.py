@@ -20,171 +20,16 @@ import shutil
 import subprocess
 from pathlib import Path
 
-# ---------------------------------------------------------------------------
-# BibTeX parser (simple, handles the .bib format we produce)
-# ---------------------------------------------------------------------------
-
-def parse_bib(path):
-    """Parse a .bib file into a list of dicts."""
-    text = Path(path).read_text(encoding="utf-8")
-    entries = []
-
-    # Match each @type{key, ... } block
-    # We track brace depth to find the matching close brace
-    i = 0
-    while i < len(text):
-        m = re.search(r"@(\w+)\s*\{", text[i:])
-        if not m:
-            break
-        entry_type = m.group(1).lower()
-        start = i + m.end()  # position right after the opening {
-
-        # Find key (everything up to first comma)
-        try:
-            key_end = text.index(",", start)
-        except ValueError:
-            line_num = text[:start].count("\n") + 1
-            raise ValueError(
-                f"{path}: malformed entry near line {line_num} — "
-                f"expected a comma after @{entry_type}{{key"
-            )
-        key = text[start:key_end].strip()
-
-        # Find matching closing brace
-        depth = 1
-        j = key_end + 1
-        while j < len(text) and depth > 0:
-            if text[j] == "{":
-                depth += 1
-            elif text[j] == "}":
-                depth -= 1
-            j += 1
-
-        if depth != 0:
-            raise ValueError(
-                f"{path}: unmatched braces in entry @{entry_type}{{{key}}}"
-            )
+try:
+    import orjson  # optional: much faster JSON encoding
+except ImportError:
+    orjson = None
 
-        body = text[key_end + 1 : j - 1]
-        try:
-            entry = parse_bib_fields(body)
-        except Exception as exc:
-            raise ValueError(
-                f"{path}: error parsing fields of @{entry_type}{{{key}}}: {exc}"
-            ) from exc
-        entry["_type"] = entry_type
-        entry["_key"] = key
-        entries.append(entry)
-        i = j
-
-    return entries
-
-
-def parse_bib_fields(body):
-    """Extract field = {value} pairs from bib entry body."""
-    fields = {}
-    # Match field = {value} or field = "value"
-    # Handle nested braces in values
-    pattern = re.compile(r"(\w+)\s*=\s*")
-    pos = 0
-    while pos < len(body):
-        m = pattern.search(body, pos)
-        if not m:
-            break
-        field_name = m.group(1).lower()
-        val_start = m.end()
-
-        # Skip whitespace
-        while val_start < len(body) and body[val_start] in " \t\n":
-            val_start += 1
-
-        if val_start >= len(body):
-            break
-
-        if body[val_start] == "{":
-            # Find matching }
-            depth = 1
-            k = val_start + 1
-            while k < len(body) and depth > 0:
-                if body[k] == "{":
-                    depth += 1
-                elif body[k] == "}":
-                    depth -= 1
-                k += 1
-            value = body[val_start + 1 : k - 1]
-            pos = k
-        elif body[val_start] == '"':
-            # Find matching "
-            k = body.index('"', val_start + 1)
-            value = body[val_start + 1 : k]
-            pos = k + 1
-        else:
-            # Bare value (number or macro)
-            end = body.find(",", val_start)
-            if end == -1:
-                end = len(body)
-            value = body[val_start:end].strip()
-            pos = end
-
-        # Clean up LaTeX commands in value
-        value = clean_latex(value)
-        fields[field_name] = value
-
-    # Convert BibTeX page ranges -- to en-dash –
-    if "pages" in fields:
-        fields["pages"] = fields["pages"].replace("--", "–")
-
-    return fields
-
-
-def clean_latex(s):
-    """Remove common LaTeX markup from a string."""
-    # \textit{...} -> ...
-    s = re.sub(r"\\textit\{([^}]*)\}", r"\1", s)
-    # \textbf{...} -> ...
-    s = re.sub(r"\\textbf\{([^}]*)\}", r"\1", s)
-    # \emph{...} -> ...
-    s = re.sub(r"\\emph\{([^}]*)\}", r"\1", s)
-    # \href{url}{text} -> text
-    s = re.sub(r"\\href\{[^}]*\}\{([^}]*)\}", r"\1", s)
-    # Special chars: \~{n} -> ñ, \'{e} -> é, \"{u} -> ü
-    s = re.sub(r"\\~\{([^}])\}", lambda m: m.group(1) + "\u0303", s)  # tilde
-    s = s.replace("\\~{n}", "ñ").replace("\\~n", "ñ")
-    s = re.sub(r"\\'\{([^}])\}", lambda m: m.group(1) + "\u0301", s)  # acute
-    s = re.sub(r'\\"\{([^}])\}', lambda m: m.group(1) + "\u0308", s)  # umlaut
-    # \& -> &
-    s = s.replace("\\&", "&")
-    # Remove remaining braces (used for capitalization protection)
-    s = s.replace("{", "").replace("}", "")
-    return s.strip()
-
-
-def format_authors(entry):
-    """Format author string for display."""
-    # If there's a custom display string, use it
-    if "authordisplay" in entry:
-        return entry["authordisplay"]
-
-    raw = entry.get("author", "")
-    # Split on " and "
-    authors = [a.strip() for a in re.split(r"\s+and\s+", raw)]
-
-    formatted = []
-    for a in authors:
-        if a.lower() == "others":
-            # This shouldn't happen if authordisplay is set, but just in case
-            formatted.append("others")
-            continue
-        # "Last, First" format — keep as-is for CV style
-        formatted.append(a)
-
-    if len(formatted) == 1:
-        return formatted[0]
-    elif len(formatted) == 2:
-        return f"{formatted[0]} and {formatted[1]}"
-    else:
-        return ", ".join(formatted[:-1]) + ", and " + formatted[-1]
+from bibparse import load_bibs, format_authors
 
+# ---------------------------------------------------------------------------
+# Author / URL helpers
+# ---------------------------------------------------------------------------
 
 def normalize_author_list(raw):
     """Normalize 'First Last' -> 'Last, First' unless already comma-formatted."""
@@ -225,52 +70,61 @@ def format_pub_url(entry):
 # CSV reading
 # ---------------------------------------------------------------------------
 
-def read_csv_file(path):
-    """Read a CSV file into a list of dicts."""
+def read_csv_file(path, numeric_specs=()):
+    """Read a CSV file into a list of dicts, validating numeric fields
+    (see validate_numeric_row) as each row is read."""
+    rows = []
     with open(path, newline="", encoding="utf-8") as f:
         reader = csv.DictReader(f)
-        return list(reader)
+        for i, row in enumerate(reader, start=2):  # row 1 is the header
+            if numeric_specs:
+                validate_numeric_row(row, i, path, numeric_specs)
+            rows.append(row)
+    return rows
+
 
+# Accepted formats for validated numeric CSV fields
+_RE_YEAR = re.compile(r"[0-9]{4}")
+_RE_MONEY = re.compile(r"\$?[0-9][0-9,]*")
 
-def _coerce_int(val, allow_commas=False, allow_dollar=False):
-    """Normalize a numeric string and return int, or raise ValueError."""
-    if allow_commas:
-        val = val.replace(",", "")
-    if allow_dollar:
-        val = val.replace("$", "")
-    return int(val)
+# (pattern, description) pairs, unpacked into numeric_checks specs
+YEAR = (_RE_YEAR, "a four-digit year")
+MONEY = (_RE_MONEY, "numeric")
 
 
-def validate_numeric_fields(rows, filepath, field_specs):
+def validate_numeric_row(row, row_num, filepath, field_specs):
     """Validate that specified fields contain numeric values (or are blank).
 
-    field_specs: list of (field_name, allow_blank, opts) tuples.
-    opts: dict with parsing options (e.g., allow_commas, allow_dollar).
+    field_specs: list of (field_name, allow_blank, pattern, description)
+    tuples, where pattern is a compiled regex the whole value must match
+    (e.g. _RE_YEAR) and description says what it expects, for the error.
     Raises ValueError with file, row number, and field name on failure.
     """
-    for i, row in enumerate(rows, start=2):  # row 1 is the header
-        for field_name, allow_blank, opts in field_specs:
-            val = row.get(field_name, "")
-            if val == "" and allow_blank:
-                continue
-            if val == "":
-                raise ValueError(
-                    f"{filepath} row {i}: '{field_name}' is blank but a value is required"
-                )
-            try:
-                _coerce_int(val, **opts)
-            except ValueError:
-                raise ValueError(
-                    f"{filepath} row {i}: '{field_name}' must be numeric, got '{val}'"
-                )
+    for field_name, allow_blank, pattern, description in field_specs:
+        val = row.get(field_name, "")
+        if val == "" and allow_blank:
+            continue
+        if val == "":
+            raise ValueError(
+                f"{filepath} row {row_num}: '{field_name}' is blank but a value is required"
+            )
+        if not pattern.fullmatch(val):
+            raise ValueError(
+                f"{filepath} row {row_num}: '{field_name}' must be {description}, got '{val}'"
+            )
 
 
 # ---------------------------------------------------------------------------
 # Main build
 # ---------------------------------------------------------------------------
 
-def build_data(data_dir):
-    """Read all data files and return a combined dict for JSON export."""
+def build_data(data_dir, bibs=None):
+    """Read all data files and return a combined dict for JSON export.
+
+    bibs: optional (publications, other_writing) entry lists already parsed
+    by the caller (see _scripts/build_all.py); otherwise both are loaded
+    here. Either list may be None if the file doesn't exist.
+    """
     data = {}
 
     # Simple CSV sections
@@ -286,35 +140,37 @@ def build_data(data_dir):
         "peer_reviews": "peer_reviews.csv",
     }
 
+    # Numeric fields to validate in each CSV
+    numeric_checks = {
+        "positions": [("start_year", False, *YEAR), ("end_year", True, *YEAR)],
+        "education": [("start_year", False, *YEAR), ("end_year", False, *YEAR)],
+        "roles": [("start_year", False, *YEAR), ("end_year", True, *YEAR)],
+        "teaching": [("start_year", False, *YEAR), ("end_year", True, *YEAR)],
+        "grants": [("year", False, *YEAR), ("amount", True, *MONEY)],
+        "admin_positions": [("start_year", False, *YEAR), ("end_year", True, *YEAR)],
+        "presentations": [("year", False, *YEAR)],
+    }
+
     for key, filename in csv_files.items():
         filepath = os.path.join(data_dir, filename)
         if os.path.exists(filepath):
-            data[key] = read_csv_file(filepath)
+            data[key] = read_csv_file(filepath, numeric_checks.get(key, ()))
         else:
             data[key] = []
 
-    # Validate numeric fields in CSVs
-    numeric_checks = {
-        "positions": [("start_year", False, {}), ("end_year", True, {})],
-        "education": [("start_year", False, {}), ("end_year", False, {})],
-        "roles": [("start_year", False, {}), ("end_year", True, {})],
-        "teaching": [("start_year", False, {}), ("end_year", True, {})],
-        "grants": [("year", False, {}), ("amount", True, {"allow_commas": True, "allow_dollar": True})],
-        "admin_positions": [("start_year", False, {}), ("end_year", True, {})],
-        "presentations": [("year", False, {})],
-    }
-    for key, specs in numeric_checks.items():
-        if data[key]:
-            filepath = os.path.join(data_dir, csv_files[key])
-            validate_numeric_fields(data[key], filepath, specs)
+    # Parse both .bib files at once, unless the caller already has
+    if bibs is None:
+        bibs = load_bibs([
+            os.path.join(data_dir, "publications.bib"),
+            os.path.join(data_dir, "other_writing.bib"),
+        ])
+    pub_entries, other_entries = bibs
 
     # Publications from .bib
-    bib_path = os.path.join(data_dir, "publications.bib")
-    if os.path.exists(bib_path):
-        raw_entries = parse_bib(bib_path)
+    if pub_entries is not None:
         publications = []
         wip_items = []
-        for entry in raw_entries:
+        for entry in pub_entries:
             entry_type = entry.get("_type", "")
             status = entry.get("status", "")
 
@@ -354,14 +210,13 @@ def build_data(data_dir):
         data["wip"] = []
 
     # Other writing from .bib
-    other_bib_path = os.path.join(data_dir, "other_writing.bib")
-    if os.path.exists(other_bib_path):
-        raw_entries = parse_bib(other_bib_path)
+    if other_entries is not None:
         other_writing = []
-        for entry in raw_entries:
-            # Normalize author order for consistent display
+        for entry in other_entries:
+            # Normalize author order for consistent display (on a copy, as
+            # the parsed entries may be shared with the research page)
             if "author" in entry and entry["author"]:
-                entry["author"] = normalize_author_list(entry["author"])
+                entry = {**entry, "author": normalize_author_list(entry["author"])}
             other_writing.append({
                 "key": entry.get("_key", ""),
                 "authors_display": format_authors(entry),
@@ -377,16 +232,14 @@ def build_data(data_dir):
     return data
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Build CV PDF")
-    parser.add_argument("--years", type=int, default=None,
-                        help="Include only the last N years (omit for full CV)")
-    parser.add_argument("--output", type=str, default=None,
-                        help="Output PDF filename (default: cv.pdf or cv-Nyear.pdf)")
-    parser.add_argument("--data-only", action="store_true",
-                        help="Only generate JSON data, don't compile PDF")
-    args = parser.parse_args()
+def build_cv(years=None, output=None, data_only=False, bibs=None):
+    """Write _generated/cv-data.json and compile the CV PDF with Typst.
 
+    years: include only the last N years (None for the full CV).
+    output: PDF filename in output/ (default: cv.pdf or cv-Nyear.pdf).
+    bibs: pre-parsed .bib entries, passed through to build_data().
+    Returns the PDF path, or None when data_only is set.
+    """
     # Paths
     script_dir = Path(__file__).parent.resolve()
     data_dir = script_dir / "data"
@@ -399,16 +252,19 @@ def main():
 
     # Build data
     print("Reading data files...")
-    data = build_data(str(data_dir))
+    data = build_data(str(data_dir), bibs)
 
     # Write JSON
     json_path = gen_dir / "cv-data.json"
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        json_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
     print(f"Generated {json_path}")
 
-    if args.data_only:
-        return
+    if data_only:
+        return None
 
     # Compile with Typst (CLI via Homebrew)
     print("Compiling PDF...")
@@ -421,10 +277,10 @@ def main():
     input_path = str(script_dir / "cv.typ")
 
     # Determine output filename
-    if args.output:
-        out_name = args.output
-    elif args.years:
-        out_name = f"cv-{args.years}year.pdf"
+    if output:
+        out_name = output
+    elif years:
+        out_name = f"cv-{years}year.pdf"
     else:
         out_name = "cv.pdf"
     output_path = str(output_dir / out_name)
@@ -432,8 +288,8 @@ def main():
     cmd = [typst_bin, "compile", input_path, output_path, "--root", str(script_dir)]
 
     # Pass sys.inputs (Typst CLI: --input key=value)
-    if args.years is not None:
-        cmd += ["--input", f"years={args.years}"]
+    if years is not None:
+        cmd += ["--input", f"years={years}"]
 
     try:
         subprocess.run(cmd, check=True)
@@ -441,6 +297,20 @@ def main():
     except subprocess.CalledProcessError as e:
         print(f"Typst compilation error:\n{e}")
         sys.exit(1)
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build CV PDF")
+    parser.add_argument("--years", type=int, default=None,
+                        help="Include only the last N years (omit for full CV)")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Output PDF filename (default: cv.pdf or cv-Nyear.pdf)")
+    parser.add_argument("--data-only", action="store_true",
+                        help="Only generate JSON data, don't compile PDF")
+    args = parser.parse_args()
+
+    build_cv(args.years, args.output, args.data_only)
 
 
 if __name__ == "__main__":
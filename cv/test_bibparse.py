@@ -0,0 +1,73 @@
+"""
+Tests for bibparse.py.
+
+Run from cv/: python3 -m unittest test_bibparse
+"""
+
+import os
+import tempfile
+import unittest
+
+from bibparse import parse_bib
+
+# What BibDesk appends to a .bib once static groups are in use
+BIBDESK_GROUPS = """@comment{BibDesk Static Groups{
+<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
+<plist version="1.0">
+<array>
+	<dict>
+		<key>group name</key>
+		<string>Aid {and} targeting</string>
+		<key>keys</key>
+		<string>briggs2024beliefs</string>
+	</dict>
+</array>
+</plist>
+}}
+"""
+
+
+class ParseBibTest(unittest.TestCase):
+    def parse(self, text):
+        fd, path = tempfile.mkstemp(suffix=".bib")
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        return parse_bib(path)
+
+    def test_skips_bibdesk_comment_block(self):
+        entries = self.parse(
+            "@article{briggs2024beliefs,\n"
+            "\tauthor = {Briggs, Ryan C.},\n"
+            "\ttitle = {Beliefs, Values, and Practices in Development Studies},\n"
+            "\tyear = {2024}}\n\n"
+            + BIBDESK_GROUPS
+        )
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["_key"], "briggs2024beliefs")
+        self.assertEqual(entries[0]["year"], "2024")
+
+    def test_skips_string_and_preamble_blocks(self):
+        entries = self.parse(
+            '@string{jds = "Journal of Development Studies"}\n'
+            "@preamble{{\\newcommand{\\noop}[1]{}}}\n"
+            "@article{k, title = {T}, year = 2020}\n"
+        )
+        self.assertEqual([e["_key"] for e in entries], ["k"])
+
+    def test_tolerates_concatenation_and_stray_text(self):
+        entries = self.parse(
+            "@article{k,\n"
+            "  title = {A} # {B},\n"
+            "  stray words\n"
+            "  year = {2020}}\n"
+            "@article{k2, title = {Next}}\n"
+        )
+        self.assertEqual([e["_key"] for e in entries], ["k", "k2"])
+        self.assertEqual(entries[0]["title"], "A")
+        self.assertEqual(entries[0]["year"], "2020")
+
+
+if __name__ == "__main__":
+    unittest.main()